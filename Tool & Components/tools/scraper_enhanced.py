@@ -4,23 +4,53 @@ Enhanced Site Scraper - A modular, configurable web scraping tool for UI analysi
 Built with Playwright for robust JavaScript rendering and comprehensive asset collection.
 """
 
+from __future__ import annotations
+
+import argparse
 import asyncio
+import copy
+import functools
 import os
 import re
 import json
+import shutil
 import pathlib
 import hashlib
 import mimetypes
 import logging
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Any, Callable
-from urllib.parse import urlparse, urljoin, urldefrag
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Set, Optional, Any, Callable, Pattern, Union, TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit, urljoin, SplitResult
 from abc import ABC, abstractmethod
 import yaml
 from pathlib import Path
 
+# Playwright is imported where it is used so --help and --save-config start quickly
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Response, Route
+
+try:  # libyaml C bindings are several times faster when available
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+try:
+    import orjson
+except ImportError:  # optional, stdlib json is used as a fallback
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:  # optional, only needed when cache_pages is enabled
+    diskcache = None
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # optional, only used for very large crawls
+    ScalableBloomFilter = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,10 +58,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# File suffixes of links that point at assets rather than pages
+_ASSET_SUFFIXES = (
+    ".pdf", ".zip", ".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg", ".ico",
+    ".mp4", ".mov", ".mp3", ".wav", ".woff", ".woff2", ".ttf", ".eot", ".css", ".js",
+)
+# Blocklist entries that are plain hostnames (only "\." escapes) and can be matched by set lookup
+_PLAIN_HOST_RE = re.compile(r"^[\w\-]+(?:\\\.[\w\-]+)+$")
+# Crawls above this many pages track saved asset URLs in a Bloom filter
+_BLOOM_MIN_PAGES = 10_000
+
+# Asset bodies at least this large are hashed in a worker thread (hashlib releases the GIL)
+_THREAD_HASH_MIN_BYTES = 64 * 1024
+
+# Only links with these schemes can lead to a crawlable page
+_CRAWL_SCHEMES = frozenset({"http", "https"})
+
+# Characters not allowed in filenames, mapped to "_"
+_FN_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+@functools.lru_cache(maxsize=65536)
+def _cached_urlsplit(url: str) -> SplitResult:
+    """Memoized urlsplit; the same URL is parsed by several pipeline stages."""
+    return urlsplit(url)
+
+@functools.lru_cache(maxsize=256)
+def _guess_ext(mime_type: str) -> str:
+    """Memoized file extension for a MIME type, defaulting to .bin."""
+    return mimetypes.guess_extension(mime_type) or ".bin"
+
+@functools.lru_cache(maxsize=None)
+def _compile_blocklist(patterns: tuple) -> Optional[Pattern]:
+    """Compile patterns into one alternation; None for an empty list (which would match everything)."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+@functools.lru_cache(maxsize=None)
+def _split_blocklist(patterns: tuple) -> tuple:
+    """Split patterns into a set of plain hostnames and one compiled alternation for the rest."""
+    hosts = set()
+    regex_patterns = []
+    for p in patterns:
+        if _PLAIN_HOST_RE.match(p):
+            hosts.add(p.replace("\\.", ".").lower())
+        else:
+            regex_patterns.append(p)
+    return frozenset(hosts), _compile_blocklist(tuple(regex_patterns))
+
+def _content_digest(body: bytes) -> bytes:
+    """Short BLAKE2b digest used to detect identical asset bodies within one crawl."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
 # ============================================================================
 # Configuration Classes
 # ============================================================================
 
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime: float) -> Any:
+    """Parse a YAML file; mtime is part of the cache key so edits are picked up."""
+    with open(path, 'r', buffering=65536) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 @dataclass
 class ScraperConfig:
     """Configuration class for scraper behavior and limits."""
@@ -53,6 +141,8 @@ class ScraperConfig:
         r"googletagmanager\.com", r"google-analytics\.com", r"hotjar\.com",
         r"facebook\.com", r"doubleclick\.net", r"googlesyndication\.com"
     ])
+    # Request resource types aborted before download (media is never saved)
+    abort_resource_types: List[str] = field(default_factory=lambda: ["media"])
     
     # Browser settings
     headless: bool = True
@@ -73,12 +163,23 @@ class ScraperConfig:
     respect_robots_txt: bool = False
     custom_headers: Dict[str, str] = field(default_factory=dict)
     
+    # Page cache (requires diskcache): serve previously fetched HTML documents from disk
+    cache_pages: bool = False
+    cache_ttl_s: Optional[int] = None  # None keeps cached pages until evicted
+    
+    @property
+    def _blocklist(self) -> tuple:
+        """(hostname set, regex alternation) for the current block_host_patterns."""
+        # Derived on access, so assigning block_host_patterns after construction takes effect
+        return _split_blocklist(tuple(self.block_host_patterns))
+    
     @classmethod
     def from_file(cls, config_path: str) -> 'ScraperConfig':
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as f:
-                config_data = yaml.safe_load(f)
+            mtime = os.stat(config_path).st_mtime
+            # Copy so callers can't mutate the cached lists/dicts
+            config_data = copy.deepcopy(_load_yaml_cached(config_path, mtime))
             return cls(**config_data)
         except Exception as e:
             logger.warning(f"Failed to load config from {config_path}: {e}")
@@ -87,8 +188,12 @@ class ScraperConfig:
     def save_to_file(self, config_path: str):
         """Save configuration to YAML file."""
         try:
-            with open(config_path, 'w') as f:
-                yaml.dump(self.__dict__, f, default_flow_style=False, indent=2)
+            # Safe dumpers can't represent tuples; lists also load back cleanly
+            data = {k: list(v) if isinstance(v, tuple) else v for k, v in asdict(self).items()}
+            # Serialize first so the file gets one write instead of one per token
+            text = yaml.dump(data, Dumper=_YamlDumper, default_flow_style=False, indent=2)
+            with open(config_path, 'w', buffering=1024 * 1024) as f:
+                f.write(text)
             logger.info(f"Configuration saved to {config_path}")
         except Exception as e:
             logger.error(f"Failed to save config to {config_path}: {e}")
@@ -103,7 +208,7 @@ class URLUtils:
     @staticmethod
     def sanitize_path(path: str) -> str:
         """Sanitize URL path for filesystem use."""
-        u = urlparse(path)
+        u = _cached_urlsplit(path)
         path = u.path
         if not path or path.endswith("/"):
             path = path + "index.html"
@@ -116,59 +221,131 @@ class URLUtils:
             return None
         
         href = href.strip()
-        if href.startswith(("mailto:", "tel:", "javascript:", "#")):
+        if not href or href[0] == "#":
             return None
         
         try:
-            abs_url = urljoin(current_url, href)
-            abs_url, _frag = urldefrag(abs_url)
-            return abs_url
+            abs_url = urljoin(current_url, href).partition("#")[0]
         except Exception:
             return None
+        
+        # Rejects mailto:, tel:, javascript:, data: and unknown schemes in one lookup
+        if _cached_urlsplit(abs_url).scheme not in _CRAWL_SCHEMES:
+            return None
+        return abs_url
     
     @staticmethod
-    def is_same_origin(seed: str, candidate: str) -> bool:
-        """Check if two URLs have the same origin."""
-        a, b = urlparse(seed), urlparse(candidate)
+    def is_same_origin(seed: Union[str, SplitResult], candidate: str) -> bool:
+        """Check if two URLs have the same origin. The seed may be passed pre-parsed."""
+        a = _cached_urlsplit(seed) if isinstance(seed, str) else seed
+        b = _cached_urlsplit(candidate)
         return (a.scheme, a.netloc) == (b.scheme, b.netloc)
     
     @staticmethod
     def matches_blocklist(url: str, patterns: List[str]) -> bool:
         """Check if URL matches any blocklist pattern."""
-        return any(re.search(p, url) for p in patterns)
+        return URLUtils.matches_blocklist_compiled(url, _compile_blocklist(tuple(patterns)))
+    
+    @staticmethod
+    def matches_blocklist_compiled(url: str, compiled: Optional[Pattern]) -> bool:
+        """Check if URL matches a precompiled blocklist alternation."""
+        return compiled is not None and bool(compiled.search(url))
+    
+    @staticmethod
+    def is_blocked(url: str, config: ScraperConfig) -> bool:
+        """Check if URL's host (or a parent domain) is blocked, falling back to regex patterns."""
+        block_hosts, block_regex = config._blocklist
+        if block_hosts:
+            host = _cached_urlsplit(url).hostname or ""
+            while host:
+                if host in block_hosts:
+                    return True
+                host = host.partition(".")[2]
+        return URLUtils.matches_blocklist_compiled(url, block_regex)
     
     @staticmethod
     def is_asset_url(url: str) -> bool:
         """Check if URL points to an asset file."""
-        asset_extensions = r"\.(pdf|zip|png|jpe?g|webp|gif|svg|ico|mp4|mov|mp3|wav|woff2?|ttf|eot)$"
-        return bool(re.search(asset_extensions, url, re.I))
+        return _cached_urlsplit(url).path.lower().endswith(_ASSET_SUFFIXES)
 
 class FileUtils:
     """Utility class for file operations."""
     
     @staticmethod
-    def get_output_path(base_dir: pathlib.Path, url: str, content_type: str) -> pathlib.Path:
-        """Generate output file path for a URL and content type."""
-        u = urlparse(url)
-        safe_host = u.netloc.replace(":", "_")
+    def get_output_path(base_dir: pathlib.Path, url: str, content_type: str,
+                        ensured_dirs: Optional[Set[pathlib.Path]] = None,
+                        host_dirs: Optional[Dict[tuple, pathlib.Path]] = None) -> pathlib.Path:
+        """Generate output file path for a URL and content type.
+        
+        host_dirs caches (base_dir, netloc) -> per-host output directory across calls.
+        """
+        u = _cached_urlsplit(url)
+        host_key = (base_dir, u.netloc)
+        host_dir = host_dirs.get(host_key) if host_dirs is not None else None
+        if host_dir is None:
+            host_dir = base_dir / u.netloc.replace(":", "_").replace(".", "_")
+            if host_dirs is not None:
+                host_dirs[host_key] = host_dir
         path = URLUtils.sanitize_path(url)
-        target = base_dir / safe_host / path.lstrip("/")
+        target = host_dir / path.lstrip("/")
         
         if content_type.startswith("text/html") and not target.name.endswith(".html"):
             target = target.with_suffix(".html")
         
-        target.parent.mkdir(parents=True, exist_ok=True)
+        FileUtils.ensure_directory(target.parent, ensured_dirs)
         return target
     
     @staticmethod
-    def ensure_directory(path: pathlib.Path):
-        """Ensure directory exists, creating parents if necessary."""
-        path.mkdir(parents=True, exist_ok=True)
+    def ensure_directory(path: pathlib.Path, ensured_dirs: Optional[Set[pathlib.Path]] = None):
+        """Ensure directory exists, creating parents if necessary.
+        
+        Directories recorded in ensured_dirs are assumed to exist and skip the mkdir syscall.
+        """
+        if ensured_dirs is None or path not in ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            if ensured_dirs is not None:
+                ensured_dirs.add(path)
+    
+    @staticmethod
+    def write_json(path: pathlib.Path, data: Any):
+        """Write data as compact, key-sorted UTF-8 JSON in one write, using orjson when installed."""
+        if orjson is not None:
+            buf = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+        else:
+            buf = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        path.write_bytes(buf)
+    
+    @staticmethod
+    def write_bytes(path: pathlib.Path, data: bytes):
+        """Write data in one call (use asyncio.to_thread from async code).
+        
+        An existing file is unlinked first, so files hard-linked to it keep their content.
+        """
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        with open(path, 'wb') as f:
+            f.write(data)
+    
+    @staticmethod
+    def link_or_copy(src: pathlib.Path, dst: pathlib.Path) -> bool:
+        """Hard-link dst to src, copying instead if linking is not possible.
+        
+        Returns False without touching dst if it already exists.
+        """
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            return False
+        except OSError:
+            shutil.copyfile(src, dst)
+        return True
     
     @staticmethod
     def safe_filename(filename: str) -> str:
         """Convert filename to filesystem-safe version."""
-        return re.sub(r'[<>:"/\\|?*]', '_', filename)
+        return filename.translate(_FN_TABLE)
 
 # ============================================================================
 # Data Collection Classes
@@ -181,8 +358,9 @@ class UICollector:
         self.inventory = {
             "seed": "",
             "pages": [],
-            "fonts": set(),
-            "colors": set(),
+            # Insertion-ordered dicts used as sets: first-seen order, no rehash on finalize
+            "fonts": {},
+            "colors": {},
             "buttons": [],
             "links": [],
             "css_variables": {},
@@ -196,134 +374,131 @@ class UICollector:
                 "scraping_end": ""
             }
         }
+        # update_inventory may run in worker threads for several pages at once
+        self._lock = threading.Lock()
     
     async def collect_from_page(self, page: Page, url: str) -> Dict[str, Any]:
         """Collect UI data from a single page."""
         try:
-            # Basic UI elements
-            ui_data = await page.evaluate("""
+            # Single DOM walk returning UI elements, CSS variables and page metadata
+            data = await page.evaluate("""
             () => {
-                const styles = getComputedStyle(document.documentElement);
-                const gather = () => {
-                    const fonts = new Set();
-                    const colors = new Set();
-                    const links = [];
-                    const buttons = [];
-                    const canvases = [];
-                    const controls = [];
-                    const components = [];
-                    
-                    const push = (s) => {
-                        const f = s.fontFamily || s.font || "";
-                        if (f) fonts.add(f);
-                        
-                        ["color", "backgroundColor", "borderTopColor", "borderColor"].forEach(k => {
-                            const v = s[k];
-                            if (v && v.startsWith("rgb")) colors.add(v);
-                        });
-                    };
+                const fonts = new Set();
+                const colors = new Set();
+                const links = [];
+                const buttons = [];
+                const canvases = [];
+                const controls = [];
+                const components = [];
+                const colorProps = ["color", "backgroundColor", "borderTopColor", "borderColor"];
+                
+                const all = document.querySelectorAll("*");
+                for (let i = 0; i < all.length; i++) {
+                    const el = all[i];
+                    const s = getComputedStyle(el);
+                    const tag = el.tagName;
+                    const role = el.getAttribute("role");
+                    let isControl = role === "slider";
                     
-                    document.querySelectorAll("*").forEach(el => {
-                        const s = getComputedStyle(el);
-                        
-                        if (el.tagName === "A") {
+                    switch (tag) {
+                        case "A":
                             links.push({
                                 text: el.textContent.trim(),
                                 href: el.href,
                                 classes: el.className
                             });
-                        }
-                        
-                        if (el.tagName === "BUTTON" || el.getAttribute("role") === "button" || s.cursor === "pointer") {
-                            const rect = el.getBoundingClientRect();
-                            if (rect.width >= 60 && rect.height >= 28) {
-                                buttons.push({
-                                    text: el.textContent.trim(),
-                                    w: rect.width,
-                                    h: rect.height,
-                                    classes: el.className
-                                });
-                            }
-                        }
-                        
-                        if (el.tagName === "CANVAS") {
+                            break;
+                        case "CANVAS": {
                             const rect = el.getBoundingClientRect();
                             canvases.push({
                                 w: Math.round(rect.width),
                                 h: Math.round(rect.height)
                             });
+                            break;
                         }
-                        
-                        if (el.matches('input, select, textarea') || el.getAttribute('role') === 'slider') {
-                            const type = el.getAttribute('type') || el.tagName.toLowerCase();
-                            const rect = el.getBoundingClientRect();
-                            controls.push({
-                                type,
-                                w: Math.round(rect.width),
-                                h: Math.round(rect.height),
+                        case "INPUT":
+                        case "SELECT":
+                        case "TEXTAREA":
+                            isControl = true;
+                            break;
+                    }
+                    
+                    if (isControl) {
+                        const rect = el.getBoundingClientRect();
+                        controls.push({
+                            type: el.getAttribute("type") || tag.toLowerCase(),
+                            w: Math.round(rect.width),
+                            h: Math.round(rect.height),
+                            classes: el.className
+                        });
+                    }
+                    
+                    if (tag === "BUTTON" || role === "button" || s.cursor === "pointer") {
+                        const rect = el.getBoundingClientRect();
+                        if (rect.width >= 60 && rect.height >= 28) {
+                            buttons.push({
+                                text: el.textContent.trim(),
+                                w: rect.width,
+                                h: rect.height,
                                 classes: el.className
                             });
                         }
-                        
-                        push(s);
-                    });
+                    }
                     
-                    return {
-                        fonts: Array.from(fonts).slice(0, 200),
-                        colors: Array.from(colors).slice(0, 200),
-                        links: links.slice(0, 200),
-                        buttons: buttons.slice(0, 100),
-                        canvases,
-                        controls,
-                        components
-                    };
-                };
-                return gather();
-            }
-            """)
-            
-            # CSS Variables
-            css_vars = await page.evaluate("""
-            () => {
+                    const f = s.fontFamily || s.font || "";
+                    if (f) fonts.add(f);
+                    for (const k of colorProps) {
+                        const v = s[k];
+                        if (v && v.startsWith("rgb")) colors.add(v);
+                    }
+                }
+                
+                // CSS variables
                 const vars = {};
                 const collectVars = (style) => {
                     if (!style) return;
                     for (let i = 0; i < style.length; i++) {
                         const prop = style[i];
-                        if (prop.startsWith('--')) {
+                        if (prop.startsWith("--")) {
                             vars[prop] = style.getPropertyValue(prop).trim();
                         }
                     }
                 };
-                
                 collectVars(document.documentElement.style);
                 for (const sheet of Array.from(document.styleSheets)) {
                     try {
-                        const rules = sheet.cssRules || [];
-                        for (const rule of Array.from(rules)) {
+                        for (const rule of Array.from(sheet.cssRules || [])) {
                             if (rule.style) collectVars(rule.style);
                         }
                     } catch (e) {}
                 }
-                return vars;
+                
+                return {
+                    ui_data: {
+                        fonts: Array.from(fonts).slice(0, 200),
+                        colors: Array.from(colors).slice(0, 200),
+                        links: links.slice(0, 200),
+                        buttons: buttons.slice(0, 100),
+                        canvases,
+                        controls,
+                        components
+                    },
+                    css_variables: vars,
+                    page_meta: {
+                        title: document.title,
+                        description: document.querySelector('meta[name="description"]')?.content || '',
+                        keywords: document.querySelector('meta[name="keywords"]')?.content || '',
+                        viewport: document.querySelector('meta[name="viewport"]')?.content || '',
+                        language: document.documentElement.lang || 'en'
+                    }
+                };
             }
             """)
             
-            # Page metadata
-            page_meta = await page.evaluate("""
-            () => ({
-                title: document.title,
-                description: document.querySelector('meta[name="description"]')?.content || '',
-                keywords: document.querySelector('meta[name="keywords"]')?.content || '',
-                viewport: document.querySelector('meta[name="viewport"]')?.content || '',
-                language: document.documentElement.lang || 'en'
-            })
-            """)
-            
             return {
-                "ui_data": ui_data,
-                "css_variables": css_vars or {},
-                "page_meta": page_meta,
+                "ui_data": data.get("ui_data", {}),
+                "css_variables": data.get("css_variables") or {},
+                "page_meta": data.get("page_meta", {}),
                 "url": url
             }
             
@@ -332,48 +507,47 @@ class UICollector:
             return {}
     
     def update_inventory(self, page_data: Dict[str, Any]):
-        """Update the main inventory with page data."""
+        """Update the main inventory with page data (safe to call from worker threads)."""
         if not page_data:
             return
         
-        ui_data = page_data.get("ui_data", {})
-        
-        # Update fonts and colors
-        for font in ui_data.get("fonts", []):
-            self.inventory["fonts"].add(font)
-        for color in ui_data.get("colors", []):
-            self.inventory["colors"].add(color)
-        
-        # Update other collections
-        self.inventory["pages"].append({
-            "url": page_data["url"],
-            "meta": page_data.get("page_meta", {}),
-            "links": ui_data.get("links", [])[:200]
-        })
-        
-        self.inventory["buttons"].extend(ui_data.get("buttons", [])[:100])
-        self.inventory["canvases"].extend(ui_data.get("canvases", []))
-        self.inventory["interactive_controls"].extend(ui_data.get("controls", []))
-        self.inventory["components"].extend(ui_data.get("components", []))
-        
-        # Update CSS variables
-        for k, v in page_data.get("css_variables", {}).items():
-            if isinstance(v, str) and v:
-                self.inventory["css_variables"][k] = v
+        with self._lock:
+            ui_data = page_data.get("ui_data", {})
+            
+            # Update fonts and colors (already de-duplicated per page in the browser)
+            self.inventory["fonts"].update(dict.fromkeys(ui_data.get("fonts", ())))
+            self.inventory["colors"].update(dict.fromkeys(ui_data.get("colors", ())))
+            
+            # Update other collections
+            self.inventory["pages"].append({
+                "url": page_data["url"],
+                "meta": page_data.get("page_meta", {}),
+                "links": ui_data.get("links", [])[:200]
+            })
+            
+            self.inventory["buttons"].extend(ui_data.get("buttons", [])[:100])
+            self.inventory["canvases"].extend(ui_data.get("canvases", []))
+            self.inventory["interactive_controls"].extend(ui_data.get("controls", []))
+            self.inventory["components"].extend(ui_data.get("components", []))
+            
+            # Update CSS variables
+            for k, v in page_data.get("css_variables", {}).items():
+                if isinstance(v, str) and v:
+                    self.inventory["css_variables"][k] = v
     
     def finalize_inventory(self):
-        """Prepare inventory for saving (convert sets to lists, etc.)."""
-        self.inventory["fonts"] = sorted(list(self.inventory["fonts"]))
-        self.inventory["colors"] = sorted(list(self.inventory["colors"]))
+        """Prepare inventory for saving (convert font/color dicts to sorted lists, etc.)."""
+        # Sorted rather than first-seen, which depends on which worker merged first
+        self.inventory["fonts"] = sorted(self.inventory["fonts"])
+        self.inventory["colors"] = sorted(self.inventory["colors"])
         self.inventory["meta"]["scraping_end"] = time.strftime("%Y-%m-%d %H:%M:%S")
     
     def save_inventory(self, output_dir: pathlib.Path):
         """Save inventory to JSON file."""
         try:
             inv_path = output_dir / "ui_inventory.json"
-            inv_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(inv_path, 'w', encoding='utf-8') as f:
-                json.dump(self.inventory, f, indent=2, ensure_ascii=False)
+            FileUtils.ensure_directory(inv_path.parent)
+            FileUtils.write_json(inv_path, self.inventory)
             logger.info(f"UI inventory saved to {inv_path}")
         except Exception as e:
             logger.error(f"Failed to save UI inventory: {e}")
@@ -414,19 +588,15 @@ class ScreenshotProcessor(PageProcessor):
                 full_page=True
             )
             
-            # Mobile screenshot (create new page with mobile viewport)
-            mobile_page = page.context.new_page()
-            await mobile_page.set_viewport_size(self.config.viewport_mobile)
-            
+            # Mobile screenshot: re-layout the already loaded page instead of navigating again
+            await page.set_viewport_size(self.config.viewport_mobile)
             try:
-                await mobile_page.goto(url, wait_until="networkidle", 
-                                     timeout=self.config.navigation_timeout_ms)
-                await mobile_page.screenshot(
+                await page.screenshot(
                     path=str(ss_dir / f"{fname}_mobile.png"),
                     full_page=True
                 )
             finally:
-                await mobile_page.close()
+                await page.set_viewport_size(self.config.viewport_desktop)
             
             logger.debug(f"Screenshots saved for {url}")
             return True
@@ -440,6 +610,10 @@ class HTMLProcessor(PageProcessor):
     
     def __init__(self, config: ScraperConfig):
         self.config = config
+        # Directories created and per-host directories resolved during this crawl,
+        # so repeat saves skip the mkdir syscall and rebuilding the host name
+        self._ensured_dirs: Set[pathlib.Path] = set()
+        self._host_dirs: Dict[tuple, pathlib.Path] = {}
     
     async def process_page(self, page: Page, url: str, output_dir: pathlib.Path) -> bool:
         """Save rendered HTML content."""
@@ -448,8 +622,8 @@ class HTMLProcessor(PageProcessor):
         
         try:
             rendered_html = await page.content()
-            html_path = FileUtils.get_output_path(output_dir, url, "text/html")
-            html_path.write_text(rendered_html, encoding="utf-8")
+            html_path = FileUtils.get_output_path(output_dir, url, "text/html", self._ensured_dirs, self._host_dirs)
+            await asyncio.to_thread(FileUtils.write_bytes, html_path, rendered_html.encode("utf-8"))
             logger.debug(f"HTML saved for {url}")
             return True
         except Exception as e:
@@ -462,7 +636,22 @@ class AssetProcessor:
     def __init__(self, config: ScraperConfig, output_dir: pathlib.Path):
         self.config = config
         self.output_dir = output_dir
-        self.saved_assets: Set[str] = set()
+        # Directories created and per-host directories resolved during this crawl,
+        # so repeat saves skip the mkdir syscall and rebuilding the host name
+        self._ensured_dirs: Set[pathlib.Path] = set()
+        self._host_dirs: Dict[tuple, pathlib.Path] = {}
+        # Large crawls trade a 0.1% chance of skipping an unseen asset for far less memory
+        self._bloom_mode = ScalableBloomFilter is not None and config.max_pages > _BLOOM_MIN_PAGES
+        self.saved_assets = (
+            ScalableBloomFilter(initial_capacity=10_000, error_rate=0.001)
+            if self._bloom_mode
+            else set()
+        )
+        # Identical bytes served from different URLs (CDN prefixes, cache busting) are stored once.
+        # The maps hold a digest and a path per asset, so Bloom-mode crawls skip content dedupe.
+        self._saved_hashes: Optional[Dict[bytes, pathlib.Path]] = None if self._bloom_mode else {}
+        # Reverse of _saved_hashes, so an overwritten path can be dropped from it
+        self._path_digests: Optional[Dict[pathlib.Path, bytes]] = None if self._bloom_mode else {}
     
     async def handle_response(self, response: Response):
         """Process and save asset responses."""
@@ -470,10 +659,8 @@ class AssetProcessor:
             return
         
         try:
+            # Blocked hosts are aborted by SiteScraper's route handler and never produce a response
             url = response.url
-            if URLUtils.matches_blocklist(url, self.config.block_host_patterns):
-                return
-            
             content_type = response.headers.get("content-type", "")
             if not content_type:
                 return
@@ -482,23 +669,52 @@ class AssetProcessor:
                 return
             
             if url in self.saved_assets:
+                if self._bloom_mode:
+                    logger.debug(f"Asset skipped as already saved (Bloom filter, may be a false positive): {url}")
                 return
             
             body = await response.body()
             if not body:
                 return
             
-            path = FileUtils.get_output_path(self.output_dir, url, content_type)
+            path = FileUtils.get_output_path(self.output_dir, url, content_type, self._ensured_dirs, self._host_dirs)
             
             # Guess extension if missing
             if not path.suffix:
-                ext = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ".bin"
-                path = path.with_suffix(ext)
-            
-            with open(path, "wb") as f:
-                f.write(body)
+                mime_type = content_type.split(";", 1)[0] if ";" in content_type else content_type
+                path = path.with_suffix(_guess_ext(mime_type.strip()))
             
+            # Mark before yielding so a concurrent response for the same URL is skipped
             self.saved_assets.add(url)
+            
+            # HTML files are rewritten with the rendered page by HTMLProcessor, so they
+            # are never linked to each other
+            digest = None
+            if self._saved_hashes is not None and not content_type.startswith("text/html"):
+                if len(body) >= _THREAD_HASH_MIN_BYTES:
+                    digest = await asyncio.to_thread(_content_digest, body)
+                else:
+                    digest = _content_digest(body)
+                existing = self._saved_hashes.get(digest)
+                if existing == path:
+                    logger.debug(f"Asset deduplicated: {url} -> {existing}")
+                    return
+                # Only link into a new path; an existing one is overwritten below instead
+                if existing is not None and await asyncio.to_thread(FileUtils.link_or_copy, existing, path):
+                    logger.debug(f"Asset deduplicated: {url} -> {existing}")
+                    return
+            
+            # Playwright has no streaming body API; keep the blocking write off the event loop
+            await asyncio.to_thread(FileUtils.write_bytes, path, body)
+            
+            # The old content of this path is gone, so it can no longer serve as a link source
+            if self._path_digests is not None:
+                old_digest = self._path_digests.pop(path, None)
+                if old_digest is not None and self._saved_hashes.get(old_digest) == path:
+                    del self._saved_hashes[old_digest]
+            if digest is not None:
+                self._saved_hashes[digest] = path
+                self._path_digests[path] = digest
             logger.debug(f"Asset saved: {url}")
             
         except Exception as e:
@@ -521,14 +737,24 @@ class SiteScraper:
         ]
         
         # State tracking
-        self.to_visit = asyncio.Queue()
+        self.to_visit = asyncio.Queue(maxsize=max(1000, self.config.max_pages * 10))
         self.seen_urls: Set[str] = set()
         self.failed_urls: Set[str] = set()
+        self._queued: Set[str] = set()
         self.page_count = 0
+        # Reserved page slots whose navigation hasn't finished, and URLs popped over the
+        # limit meanwhile; a failed navigation frees its slot for one of them
+        self._loading = 0
+        self._deferred: List[tuple] = []
         self.start_time = time.time()
         
+        # Cache of fetched HTML documents, shared across runs with the same output directory;
+        # open only while run() is executing
+        self._page_cache = None
+        
         # Set seed URL
-        self.seed_origin = f"{urlparse(start_url).scheme}://{urlparse(start_url).netloc}"
+        self._seed_parsed = _cached_urlsplit(start_url)
+        self.seed_origin = f"{self._seed_parsed.scheme}://{self._seed_parsed.netloc}"
         self.ui_collector.inventory["seed"] = start_url
         self.ui_collector.inventory["meta"]["scraping_start"] = time.strftime("%Y-%m-%d %H:%M:%S")
     
@@ -538,44 +764,76 @@ class SiteScraper:
         logger.info(f"Output directory: {self.output_dir}")
         logger.info(f"Configuration: {self.config.max_pages} pages, {self.config.max_depth} depth")
         
+        from playwright.async_api import async_playwright
+        
+        self._open_page_cache()
         try:
             async with async_playwright() as pw:
                 browser = await pw.chromium.launch(headless=self.config.headless)
-                context = await browser.new_context(
-                    user_agent=self.config.user_agent,
-                    ignore_https_errors=True,
-                    extra_http_headers=self.config.custom_headers
-                )
-                
-                # Set up response interception
-                context.on("response", self.asset_processor.handle_response)
-                
-                # Start scraping
-                await self.to_visit.put((self.start_url, 0))
                 
-                # Create worker tasks
-                semaphore = asyncio.Semaphore(self.config.concurrency_pages)
-                workers = [
-                    asyncio.create_task(self._worker(context, semaphore))
+                # One long-lived context per worker; pages are opened and closed within it
+                contexts = [
+                    await self._new_context(browser)
                     for _ in range(self.config.concurrency_pages)
                 ]
                 
-                # Wait for completion
-                await self.to_visit.join()
+                # Start scraping
+                self._enqueue(self.start_url, 0)
                 
-                # Cancel workers
-                for worker in workers:
-                    worker.cancel()
+                # A fixed set of consumers pulls from the queue, so only
+                # concurrency_pages page coroutines ever exist at once; the task group
+                # guarantees workers are cancelled and awaited before we finalize
+                semaphore = asyncio.BoundedSemaphore(self.config.concurrency_pages)
+                async with asyncio.TaskGroup() as tg:
+                    workers = [
+                        tg.create_task(self._worker(context, semaphore))
+                        for context in contexts
+                    ]
+                    
+                    # Wait for completion
+                    await self.to_visit.join()
+                    
+                    # Cancel workers
+                    for worker in workers:
+                        worker.cancel()
                 
                 # Finalize and save results
                 await self._finalize_scraping()
                 
-                await context.close()
+                for context in contexts:
+                    await context.close()
                 await browser.close()
                 
         except Exception as e:
             logger.error(f"Scraping failed: {e}")
             raise
+        finally:
+            self._close_page_cache()
+    
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """Create a browser context with request filtering and asset capture attached."""
+        context = await browser.new_context(
+            viewport=self.config.viewport_desktop,
+            user_agent=self.config.user_agent,
+            ignore_https_errors=True,
+            extra_http_headers=self.config.custom_headers
+        )
+        
+        # Abort blocked and unwanted requests. Routing disables the browser's HTTP cache
+        # and sends every subresource through Python, so skip it when there is nothing to abort
+        if self.config.block_host_patterns or self.config.abort_resource_types:
+            await context.route("**/*", self._route_handler)
+        context.on("response", self.asset_processor.handle_response)
+        return context
+    
+    async def _route_handler(self, route: Route):
+        """Abort blocked or unwanted requests before the browser downloads them."""
+        request = route.request
+        if (request.resource_type in self.config.abort_resource_types or
+                URLUtils.is_blocked(request.url, self.config)):
+            await route.abort()
+        else:
+            await route.continue_()
     
     async def _worker(self, context: BrowserContext, semaphore: asyncio.Semaphore):
         """Worker task for processing pages."""
@@ -586,60 +844,110 @@ class SiteScraper:
                 return
             
             try:
+                # Keep draining the queue once the page limit is hit so join() can complete
                 async with semaphore:
-                    if self.page_count >= self.config.max_pages:
-                        return
                     await self._scrape_page(context, url, depth)
+            except Exception as e:
+                # Don't let one bad page take down the task group and the whole crawl
+                logger.error(f"Worker failed on {url}: {e}")
             finally:
                 self.to_visit.task_done()
     
     async def _scrape_page(self, context: BrowserContext, url: str, depth: int):
         """Scrape a single page."""
+        # Everything up to reserving a page slot runs without awaiting, so the
+        # check-then-update on seen_urls and page_count is atomic across workers
         if url in self.seen_urls:
             return
         
+        if self.page_count >= self.config.max_pages:
+            # The URL is already marked queued, so dropping it now would lose it for good
+            if self._loading:
+                self._deferred.append((url, depth))
+            return
+        
         self.seen_urls.add(url)
         
         # Check origin and blocklist
         if self.config.respect_robots_txt and not self._check_robots_txt(url):
             return
         
-        if URLUtils.matches_blocklist(url, self.config.block_host_patterns):
+        if URLUtils.is_blocked(url, self.config):
             return
         
-        # Create page and navigate
-        page = await context.new_page()
-        await page.set_viewport_size(self.config.viewport_desktop)
+        self.page_count += 1
+        self._loading += 1
+        page_number = self.page_count
+        
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
         
+        page = None
         try:
-            await page.goto(
+            # Create page and navigate
+            page = await context.new_page()
+            
+            request_url = self._request_url(url)
+            cached = await self._get_cached_document(request_url)
+            if cached is not None:
+                # Serve the document itself from the cache; subresources still load normally
+                body, content_type = cached
+                await page.route(
+                    lambda u: u == request_url,
+                    lambda route: route.fulfill(status=200, body=body, content_type=content_type)
+                )
+            
+            response = await page.goto(
                 url,
-                wait_until="networkidle",
+                wait_until="domcontentloaded",
                 timeout=self.config.navigation_timeout_ms
             )
             
+            if cached is None:
+                await self._cache_document(request_url, response)
+            
+            # Give late resources a bounded chance to settle; beacons and long-polling
+            # would otherwise hold networkidle until the navigation timeout
+            try:
+                await page.wait_for_load_state("networkidle", timeout=self.config.network_idle_ms)
+            except PlaywrightTimeoutError:
+                pass
+            
             # Add delay if specified
             if self.config.page_delay_ms > 0:
                 await asyncio.sleep(self.config.page_delay_ms / 1000)
             
         except Exception as e:
             logger.warning(f"Failed to load {url}: {e}")
-            await page.close()
+            self._loading -= 1
+            self._release_slot()
+            if page is not None:
+                await page.close()
             self.failed_urls.add(url)
             return
         
-        self.page_count += 1
-        logger.info(f"[{self.page_count}] Scraping {url}")
+        self._loading -= 1
+        if not self._loading and self.page_count >= self.config.max_pages:
+            # Every slot is confirmed, so the parked URLs can never be scraped
+            self._deferred.clear()
+        
+        logger.info(f"[{page_number}] Scraping {url}")
         
         try:
-            # Process page with all processors
-            for processor in self.page_processors:
-                await processor.process_page(page, url, self.output_dir)
+            # Process page with all processors concurrently
+            results = await asyncio.gather(
+                *(p.process_page(page, url, self.output_dir) for p in self.page_processors),
+                return_exceptions=True
+            )
+            for processor, result in zip(self.page_processors, results):
+                if isinstance(result, Exception):
+                    logger.error(f"{type(processor).__name__} failed for {url}: {result}")
             
-            # Collect UI inventory
+            # Collect UI inventory after the processors, since screenshots
+            # temporarily switch the viewport and would skew element sizes
             if self.config.collect_ui_inventory:
                 page_data = await self.ui_collector.collect_from_page(page, url)
-                self.ui_collector.update_inventory(page_data)
+                # Merging is pure CPU work; keep it off the loop so other pages keep loading
+                await asyncio.to_thread(self.ui_collector.update_inventory, page_data)
             
             # Discover new links
             await self._discover_links(page, url, depth)
@@ -653,34 +961,117 @@ class SiteScraper:
     
     async def _discover_links(self, page: Page, current_url: str, current_depth: int):
         """Discover and enqueue new links from the page."""
+        if current_depth + 1 > self.config.max_depth:
+            return
+        
         try:
             hrefs = await page.eval_on_selector_all(
                 "a[href]",
                 "els => els.map(a => a.getAttribute('href'))"
             )
             
+            seed = self._seed_parsed
+            same_origin_only = not self.config.respect_robots_txt
+            
             for href in hrefs:
                 next_url = URLUtils.normalize_link(current_url, href)
                 if not next_url:
                     continue
                 
                 # Check origin restrictions
-                if not self.config.respect_robots_txt and not URLUtils.is_same_origin(self.start_url, next_url):
-                    continue
+                if same_origin_only:
+                    candidate = _cached_urlsplit(next_url)
+                    if candidate.netloc != seed.netloc or candidate.scheme != seed.scheme:
+                        continue
                 
                 # Skip assets
                 if URLUtils.is_asset_url(next_url):
                     continue
                 
-                # Check if we should visit this URL
-                if (next_url not in self.seen_urls and 
-                    next_url not in self.failed_urls and
-                    current_depth + 1 <= self.config.max_depth):
-                    await self.to_visit.put((next_url, current_depth + 1))
+                self._enqueue(next_url, current_depth + 1)
                     
         except Exception as e:
             logger.error(f"Failed to discover links on {current_url}: {e}")
     
+    @staticmethod
+    def _request_url(url: str) -> str:
+        """URL as the browser requests it (lowercase scheme and host, "/" for an empty path)."""
+        u = _cached_urlsplit(url)
+        return urlunsplit((u.scheme.lower(), u.netloc.lower(), u.path or "/", u.query, ""))
+    
+    def _open_page_cache(self):
+        """Open the on-disk page cache if cache_pages is enabled."""
+        if not self.config.cache_pages or self._page_cache is not None:
+            return
+        if diskcache is None:
+            logger.warning("cache_pages is enabled but diskcache is not installed; page caching disabled")
+            return
+        self._page_cache = diskcache.Cache(str(self.output_dir / ".cache"))
+    
+    def _close_page_cache(self):
+        """Close the page cache, releasing its SQLite handle."""
+        if self._page_cache is not None:
+            self._page_cache.close()
+            self._page_cache = None
+    
+    @staticmethod
+    def _page_cache_key(url: str) -> str:
+        """Cache key for a page URL."""
+        return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    
+    async def _get_cached_document(self, url: str) -> Optional[tuple]:
+        """Return (body, content_type) for a cached page, or None."""
+        if self._page_cache is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._page_cache.get, self._page_cache_key(url))
+        except Exception as e:
+            logger.debug(f"Page cache read failed for {url}: {e}")
+            return None
+    
+    async def _cache_document(self, url: str, response: Optional[Response]):
+        """Store a successfully loaded HTML document in the page cache."""
+        if self._page_cache is None or response is None or not response.ok:
+            return
+        # A redirected navigation ends on another URL's document, which must not be served for this one
+        if response.url != url or response.request.redirected_from is not None:
+            return
+        content_type = response.headers.get("content-type", "")
+        if not content_type.startswith("text/html"):
+            return
+        try:
+            body = await response.body()
+            await asyncio.to_thread(
+                self._page_cache.set, self._page_cache_key(url), (body, content_type),
+                expire=self.config.cache_ttl_s
+            )
+        except Exception as e:
+            logger.debug(f"Page cache write failed for {url}: {e}")
+    
+    def _release_slot(self):
+        """Give back a reserved page slot, requeueing a URL that was parked over the limit."""
+        self.page_count -= 1
+        if self._deferred:
+            url, depth = self._deferred.pop()
+            try:
+                self.to_visit.put_nowait((url, depth))
+            except asyncio.QueueFull:
+                logger.debug(f"Crawl frontier full, dropping {url}")
+    
+    def _enqueue(self, url: str, depth: int):
+        """Queue a URL for scraping unless it has been queued before."""
+        # Every visited URL is queued first, so this also skips visited pages
+        if url in self._queued:
+            return
+        try:
+            # Never block here: workers are the only consumers, so a blocking put
+            # from a worker could deadlock once the frontier is full
+            self.to_visit.put_nowait((url, depth))
+        except asyncio.QueueFull:
+            logger.debug(f"Crawl frontier full, dropping {url}")
+            return
+        self._queued.add(url)
+    
     def _check_robots_txt(self, url: str) -> bool:
         """Check robots.txt for URL (placeholder implementation)."""
         # TODO: Implement robots.txt checking
@@ -695,12 +1086,10 @@ class SiteScraper:
         logger.info(f"Pages processed: {self.page_count}")
         logger.info(f"Failed URLs: {len(self.failed_urls)}")
         
-        # Save UI inventory
+        # Save UI inventory and summary report; serialization and writes run in a thread
         self.ui_collector.finalize_inventory()
-        self.ui_collector.save_inventory(self.output_dir)
-        
-        # Save summary report
-        self._save_summary_report(duration)
+        await asyncio.to_thread(self.ui_collector.save_inventory, self.output_dir)
+        await asyncio.to_thread(self._save_summary_report, duration)
     
     def _save_summary_report(self, duration: float):
         """Save a summary report of the scraping session."""
@@ -722,8 +1111,7 @@ class SiteScraper:
             }
             
             summary_path = self.output_dir / "scraping_summary.json"
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2, ensure_ascii=False)
+            FileUtils.write_json(summary_path, summary)
             
             logger.info(f"Summary report saved to {summary_path}")
             
@@ -734,10 +1122,26 @@ class SiteScraper:
 # CLI Interface
 # ============================================================================
 
+# Command line argument -> ScraperConfig field; arguments left as None keep the config value
+_ARG_TO_CFG = {
+    'max_pages': 'max_pages',
+    'max_depth': 'max_depth',
+    'concurrency': 'concurrency_pages',
+    'headless': 'headless',
+    'respect_robots': 'respect_robots_txt',
+    'save_screenshots': 'save_screenshots',
+    'save_html': 'save_html',
+    'save_assets': 'save_assets',
+    'collect_ui_inventory': 'collect_ui_inventory',
+    'cache_pages': 'cache_pages',
+    'timeout': 'navigation_timeout_ms',
+    'delay': 'page_delay_ms',
+    'user_agent': 'user_agent',
+}
+
+@functools.lru_cache(maxsize=1)
 def create_parser():
-    """Create command line argument parser."""
-    import argparse
-    
+    """Create command line argument parser (built once; parse_args keeps no state)."""
     parser = argparse.ArgumentParser(
         description="Enhanced Site Scraper - Modular web scraping tool for UI analysis",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -761,24 +1165,37 @@ Examples:
     parser.add_argument("--concurrency", type=int, help="Number of concurrent page workers")
     
     # Behavior options
-    parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
+    parser.add_argument("--headless", action="store_true", default=None, help="Run browser in headless mode")
     parser.add_argument("--no-headless", dest="headless", action="store_false", help="Show browser window")
     parser.add_argument("--cross-origin", action="store_true", help="Allow crawling off-site links")
-    parser.add_argument("--respect-robots", action="store_true", help="Respect robots.txt")
+    parser.add_argument("--respect-robots", action="store_true", default=None, help="Respect robots.txt")
     
     # Output options
-    parser.add_argument("--no-screenshots", dest="save_screenshots", action="store_false", help="Skip screenshots")
-    parser.add_argument("--no-html", dest="save_html", action="store_false", help="Skip HTML saving")
-    parser.add_argument("--no-assets", dest="save_assets", action="store_false", help="Skip asset saving")
-    parser.add_argument("--no-ui-inventory", dest="collect_ui_inventory", action="store_false", help="Skip UI inventory")
+    parser.add_argument("--no-screenshots", dest="save_screenshots", action="store_false", default=None, help="Skip screenshots")
+    parser.add_argument("--no-html", dest="save_html", action="store_false", default=None, help="Skip HTML saving")
+    parser.add_argument("--no-assets", dest="save_assets", action="store_false", default=None, help="Skip asset saving")
+    parser.add_argument("--no-ui-inventory", dest="collect_ui_inventory", action="store_false", default=None, help="Skip UI inventory")
     
     # Advanced options
     parser.add_argument("--timeout", type=int, help="Navigation timeout in milliseconds")
     parser.add_argument("--delay", type=int, help="Delay between pages in milliseconds")
     parser.add_argument("--user-agent", help="Custom user agent string")
+    parser.add_argument("--cache-pages", action="store_true", default=None,
+                        help="Serve previously fetched pages from <output>/.cache (requires diskcache)")
     
     return parser
 
+def apply_args_to_config(config: ScraperConfig, args: argparse.Namespace):
+    """Apply flags given on the command line to config; absent flags keep the config's values."""
+    for arg_name, cfg_name in _ARG_TO_CFG.items():
+        value = getattr(args, arg_name)
+        if value is not None:
+            setattr(config, cfg_name, value)
+    
+    # Handle cross-origin setting
+    if args.cross_origin:
+        config.respect_robots_txt = False
+
 def main():
     """Main CLI entry point."""
     parser = create_parser()
@@ -791,24 +1208,7 @@ def main():
         config = ScraperConfig()
     
     # Override config with command line arguments
-    if args.max_pages is not None:
-        config.max_pages = args.max_pages
-    if args.max_depth is not None:
-        config.max_depth = args.max_depth
-    if args.concurrency is not None:
-        config.concurrency_pages = args.concurrency
-    if args.headless is not None:
-        config.headless = args.headless
-    if args.timeout is not None:
-        config.navigation_timeout_ms = args.timeout
-    if args.delay is not None:
-        config.page_delay_ms = args.delay
-    if args.user_agent:
-        config.user_agent = args.user_agent
-    
-    # Handle cross-origin setting
-    if args.cross_origin:
-        config.respect_robots_txt = False
+    apply_args_to_config(config, args)
     
     # Save config if requested
     if args.save_config:
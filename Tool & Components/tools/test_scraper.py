@@ -6,15 +6,36 @@ Run with: pytest test_scraper.py -v
 
 import pytest
 import asyncio
+import json
+import os
+import shutil
 from pathlib import Path
+from urllib.parse import urlsplit
 from unittest.mock import Mock, AsyncMock, patch
 
 # Import scraper components
 from scraper_enhanced import (
     ScraperConfig, URLUtils, FileUtils, UICollector,
-    ScreenshotProcessor, HTMLProcessor, AssetProcessor
+    ScreenshotProcessor, HTMLProcessor, AssetProcessor, SiteScraper,
+    create_parser, apply_args_to_config
 )
 
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+
+def mock_response(url, body=b"body", content_type="image/png", redirected=False):
+    """Build a mocked Playwright response."""
+    response = Mock()
+    response.url = url
+    response.ok = True
+    response.headers = {"content-type": content_type}
+    response.body = AsyncMock(return_value=body)
+    response.request.redirected_from = Mock() if redirected else None
+    return response
+
 
 class TestScraperConfig:
     """Test configuration management."""
@@ -52,6 +73,21 @@ headless: false
         assert config.max_depth == 1
         assert config.headless is False
     
+    def test_config_from_file_reloads_on_change(self, tmp_path):
+        """Test cached config loads pick up edits and don't share state."""
+        config_file = tmp_path / "test_config.yaml"
+        config_file.write_text("max_pages: 50\nblock_host_patterns: [tracker]\n")
+        
+        first = ScraperConfig.from_file(str(config_file))
+        first.block_host_patterns.append("other")
+        second = ScraperConfig.from_file(str(config_file))
+        assert second.block_host_patterns == ["tracker"]
+        
+        config_file.write_text("max_pages: 60\n")
+        mtime = config_file.stat().st_mtime + 1
+        os.utime(config_file, (mtime, mtime))
+        assert ScraperConfig.from_file(str(config_file)).max_pages == 60
+    
     def test_save_config(self, tmp_path):
         """Test saving configuration to file."""
         config = ScraperConfig(max_pages=75, max_depth=4)
@@ -64,6 +100,11 @@ headless: false
         content = config_path.read_text()
         assert "max_pages: 75" in content
         assert "max_depth: 4" in content
+        
+        # Round-trips through from_file
+        loaded = ScraperConfig.from_file(str(config_path))
+        assert loaded.max_pages == 75
+        assert list(loaded.save_content_types) == list(config.save_content_types)
 
 
 class TestURLUtils:
@@ -88,12 +129,23 @@ class TestURLUtils:
         assert URLUtils.normalize_link(base_url, "tel:+1234567890") is None
         assert URLUtils.normalize_link(base_url, "javascript:void(0)") is None
         assert URLUtils.normalize_link(base_url, "#section") is None
+        assert URLUtils.normalize_link(base_url, "JavaScript:void(0)") is None
+        assert URLUtils.normalize_link(base_url, "data:text/html,hi") is None
+        
+        # Fragments are dropped, protocol-relative links resolved
+        assert URLUtils.normalize_link(base_url, "/about#team") == "https://example.com/about"
+        assert URLUtils.normalize_link(base_url, "//cdn.example.com/x") == "https://cdn.example.com/x"
     
     def test_is_same_origin(self):
         """Test origin checking."""
         assert URLUtils.is_same_origin("https://example.com", "https://example.com/about") is True
         assert URLUtils.is_same_origin("https://example.com", "http://example.com") is False
         assert URLUtils.is_same_origin("https://example.com", "https://other.com") is False
+        
+        # Pre-parsed seed
+        seed = urlsplit("https://example.com")
+        assert URLUtils.is_same_origin(seed, "https://example.com/about") is True
+        assert URLUtils.is_same_origin(seed, "https://other.com") is False
     
     def test_matches_blocklist(self):
         """Test blocklist pattern matching."""
@@ -103,6 +155,34 @@ class TestURLUtils:
         assert URLUtils.matches_blocklist("https://facebook.com/tracking", patterns) is True
         assert URLUtils.matches_blocklist("https://example.com", patterns) is False
     
+    def test_matches_blocklist_compiled(self):
+        """Test matching against the config's combined blocklist regex."""
+        config = ScraperConfig(block_host_patterns=[r"/track(ing)?/", r"beacon\d+\."])
+        
+        assert URLUtils.matches_blocklist_compiled("https://example.com/tracking/px", config._blocklist[1]) is True
+        assert URLUtils.matches_blocklist_compiled("https://beacon2.example.com", config._blocklist[1]) is True
+        assert URLUtils.matches_blocklist_compiled("https://example.com", config._blocklist[1]) is False
+        
+        # An empty blocklist must not match everything
+        empty = ScraperConfig(block_host_patterns=[])
+        assert URLUtils.matches_blocklist_compiled("https://example.com", empty._blocklist[1]) is False
+    
+    def test_is_blocked(self):
+        """Test host-set blocking with regex fallback."""
+        config = ScraperConfig(block_host_patterns=[r"google\.com", r"ads\d+\.example\.org"])
+        
+        assert config._blocklist[0] == {"google.com"}
+        assert URLUtils.is_blocked("https://google.com/analytics", config) is True
+        assert URLUtils.is_blocked("https://www.GOOGLE.com:443/x", config) is True
+        assert URLUtils.is_blocked("https://ads42.example.org/pixel", config) is True
+        assert URLUtils.is_blocked("https://notgoogle.community/", config) is False
+        assert URLUtils.is_blocked("https://example.com", config) is False
+        
+        # Patterns assigned after construction take effect
+        config.block_host_patterns = [r"example\.com"]
+        assert URLUtils.is_blocked("https://example.com", config) is True
+        assert URLUtils.is_blocked("https://google.com/analytics", config) is False
+    
     def test_is_asset_url(self):
         """Test asset URL detection."""
         assert URLUtils.is_asset_url("https://example.com/image.png") is True
@@ -110,6 +190,8 @@ class TestURLUtils:
         assert URLUtils.is_asset_url("https://example.com/script.js") is True
         assert URLUtils.is_asset_url("https://example.com/font.woff2") is True
         assert URLUtils.is_asset_url("https://example.com/page") is False
+        assert URLUtils.is_asset_url("https://example.com/Photo.JPG?v=3") is True
+        assert URLUtils.is_asset_url("https://example.com/docs?file=a.pdf") is False
 
 
 class TestFileUtils:
@@ -132,9 +214,35 @@ class TestFileUtils:
         assert new_dir.exists()
         assert new_dir.is_dir()
     
+    def test_get_output_path_recreates_removed_directories(self, tmp_path):
+        """Test a new crawl recreates output directories removed after an earlier one."""
+        url = "https://example.com/img/logo.png"
+        first_crawl = set()
+        FileUtils.get_output_path(tmp_path, url, "image/png", first_crawl)
+        assert (tmp_path / "example_com" / "img") in first_crawl
+        
+        shutil.rmtree(tmp_path / "example_com")
+        path = FileUtils.get_output_path(tmp_path, url, "image/png", set())
+        assert path.parent.is_dir()
+    
+    def test_write_bytes_breaks_links(self, tmp_path):
+        """Test rewriting a hard-linked file leaves the other link intact and keeps default permissions."""
+        first = tmp_path / "a.png"
+        second = tmp_path / "b.png"
+        first.write_bytes(b"old")
+        os.link(first, second)
+        
+        FileUtils.write_bytes(second, b"new")
+        
+        assert first.read_bytes() == b"old"
+        assert second.read_bytes() == b"new"
+        assert second.stat().st_mode & 0o777 == first.stat().st_mode & 0o777
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.png", "b.png"]
+    
     def test_safe_filename(self):
         """Test filename sanitization."""
-        assert FileUtils.safe_filename("file<>:\"/\\|?*.txt") == "file_______.txt"
+        # Each of the nine forbidden characters maps to one underscore
+        assert FileUtils.safe_filename("file<>:\"/\\|?*.txt") == "file_________.txt"
         assert FileUtils.safe_filename("normal-file.txt") == "normal-file.txt"
 
 
@@ -172,18 +280,35 @@ class TestUICollector:
         assert "rgb(255, 0, 0)" in collector.inventory["colors"]
         assert len(collector.inventory["pages"]) == 1
         assert len(collector.inventory["buttons"]) == 1
+        
+        # Fonts keep first-seen order across pages
+        page_data["ui_data"]["fonts"] = ["Helvetica", "Georgia"]
+        collector.update_inventory(page_data)
+        assert list(collector.inventory["fonts"]) == ["Arial", "Helvetica", "Georgia"]
     
     def test_finalize_inventory(self):
         """Test inventory finalization."""
         collector = UICollector()
-        collector.inventory["fonts"].add("Arial")
-        collector.inventory["colors"].add("rgb(255, 0, 0)")
+        collector.inventory["fonts"]["Verdana"] = None
+        collector.inventory["fonts"]["Arial"] = None
+        collector.inventory["colors"]["rgb(255, 0, 0)"] = None
         
         collector.finalize_inventory()
         
-        assert isinstance(collector.inventory["fonts"], list)
+        assert collector.inventory["fonts"] == ["Arial", "Verdana"]
         assert isinstance(collector.inventory["colors"], list)
         assert "scraping_end" in collector.inventory["meta"]
+    
+    def test_save_inventory(self, tmp_path):
+        """Test inventory is written as UTF-8 JSON."""
+        collector = UICollector()
+        collector.inventory["fonts"]["Séance"] = None
+        collector.finalize_inventory()
+        
+        collector.save_inventory(tmp_path)
+        
+        saved = json.loads((tmp_path / "ui_inventory.json").read_text(encoding="utf-8"))
+        assert saved["fonts"] == ["Séance"]
 
 
 class TestPageProcessors:
@@ -195,7 +320,7 @@ class TestPageProcessors:
         processor = ScreenshotProcessor(config)
         
         # Should return True when screenshots are disabled
-        assert processor.process_page(Mock(), "https://example.com", Path("/tmp")) is True
+        assert asyncio.run(processor.process_page(Mock(), "https://example.com", Path("/tmp"))) is True
     
     def test_html_processor_config(self):
         """Test HTML processor configuration."""
@@ -203,7 +328,16 @@ class TestPageProcessors:
         processor = HTMLProcessor(config)
         
         # Should return True when HTML saving is disabled
-        assert processor.process_page(Mock(), "https://example.com", Path("/tmp")) is True
+        assert asyncio.run(processor.process_page(Mock(), "https://example.com", Path("/tmp"))) is True
+    
+    def test_html_processor_writes_rendered_html(self, tmp_path):
+        """Test rendered HTML is written as UTF-8."""
+        processor = HTMLProcessor(ScraperConfig())
+        page = Mock()
+        page.content = AsyncMock(return_value="<html>Café</html>")
+        
+        assert asyncio.run(processor.process_page(page, "https://example.com/about", tmp_path)) is True
+        assert (tmp_path / "example_com" / "about.html").read_text(encoding="utf-8") == "<html>Café</html>"
 
 
 class TestAssetProcessor:
@@ -218,6 +352,14 @@ class TestAssetProcessor:
         assert processor.config == config
         assert processor.output_dir == output_dir
         assert isinstance(processor.saved_assets, set)
+    
+    @pytest.mark.skipif(ScalableBloomFilter is None, reason="pybloom-live not installed")
+    def test_asset_processor_bloom_mode(self):
+        """Test large crawls track URLs in a Bloom filter without per-asset hash maps."""
+        processor = AssetProcessor(ScraperConfig(max_pages=50_000), Path("/tmp"))
+        assert isinstance(processor.saved_assets, ScalableBloomFilter)
+        assert processor._saved_hashes is None
+        assert processor._path_digests is None
 
 
 # Integration tests (require proper mocking)
@@ -229,31 +371,212 @@ class TestAsyncComponents:
         """Test UI data collection from page (mocked)."""
         collector = UICollector()
         
-        # Mock page with evaluate method
+        # Mock page with a single fused evaluate call
         mock_page = Mock()
         mock_page.evaluate = AsyncMock(return_value={
-            "fonts": ["Arial"],
-            "colors": ["rgb(255, 0, 0)"],
-            "links": [],
-            "buttons": [],
-            "canvases": [],
-            "controls": [],
-            "components": []
+            "ui_data": {
+                "fonts": ["Arial"],
+                "colors": ["rgb(255, 0, 0)"],
+                "links": [],
+                "buttons": [],
+                "canvases": [],
+                "controls": [],
+                "components": []
+            },
+            "css_variables": {"--primary": "rgb(255, 0, 0)"},
+            "page_meta": {"title": "Test Page", "description": "", "keywords": "", "viewport": "", "language": "en"}
         })
         
-        # Mock CSS variables evaluation
-        mock_page.evaluate.side_effect = [
-            {"fonts": ["Arial"], "colors": ["rgb(255, 0, 0)"], "links": [], "buttons": [], "canvases": [], "controls": [], "components": []},
-            {"--primary": "rgb(255, 0, 0)"},
-            {"title": "Test Page", "description": "", "keywords": "", "viewport": "", "language": "en"}
-        ]
-        
         result = await collector.collect_from_page(mock_page, "https://example.com")
         
         assert "ui_data" in result
         assert "css_variables" in result
         assert "page_meta" in result
         assert result["url"] == "https://example.com"
+        assert result["css_variables"] == {"--primary": "rgb(255, 0, 0)"}
+        assert result["page_meta"]["title"] == "Test Page"
+        
+        # UI data, CSS variables and metadata come back from one browser round-trip
+        mock_page.evaluate.assert_awaited_once()
+    
+    async def test_asset_processor_dedupes_identical_bodies(self, tmp_path):
+        """Test identical asset bodies at different URLs are written once."""
+        processor = AssetProcessor(ScraperConfig(), tmp_path)
+        
+        await processor.handle_response(mock_response("https://cdn-a.example.com/logo.png", b"same-bytes"))
+        await processor.handle_response(mock_response("https://cdn-b.example.com/logo.png", b"same-bytes"))
+        
+        first = tmp_path / "cdn-a_example_com" / "logo.png"
+        second = tmp_path / "cdn-b_example_com" / "logo.png"
+        assert second.read_bytes() == b"same-bytes"
+        assert first.stat().st_ino == second.stat().st_ino
+        assert len(processor.saved_assets) == 2
+    
+    async def test_asset_processor_rewrite_keeps_linked_copies(self, tmp_path):
+        """Test overwriting a deduplicated path leaves the files it was linked with intact."""
+        processor = AssetProcessor(ScraperConfig(), tmp_path)
+        
+        await processor.handle_response(mock_response("https://cdn-a.example.com/logo.png", b"v1"))
+        await processor.handle_response(mock_response("https://cdn-b.example.com/logo.png", b"v1"))
+        # Cache-busted URL maps to the same file as the linked copy
+        await processor.handle_response(mock_response("https://cdn-b.example.com/logo.png?v=2", b"v2"))
+        
+        assert (tmp_path / "cdn-a_example_com" / "logo.png").read_bytes() == b"v1"
+        assert (tmp_path / "cdn-b_example_com" / "logo.png").read_bytes() == b"v2"
+        
+        # An overwritten file is no longer used as a link source for its old content
+        await processor.handle_response(mock_response("https://cdn-a.example.com/logo.png?v=2", b"v2"))
+        await processor.handle_response(mock_response("https://cdn-c.example.com/logo.png", b"v1"))
+        assert (tmp_path / "cdn-c_example_com" / "logo.png").read_bytes() == b"v1"
+        
+        # Identical HTML shells are written separately, since HTMLProcessor rewrites them
+        await processor.handle_response(mock_response("https://example.com/a", b"<html>", "text/html"))
+        await processor.handle_response(mock_response("https://example.com/b", b"<html>", "text/html"))
+        page_a = tmp_path / "example_com" / "a.html"
+        page_b = tmp_path / "example_com" / "b.html"
+        assert page_a.stat().st_ino != page_b.stat().st_ino
+    
+    async def test_page_cache_serves_seed_and_skips_redirects(self, tmp_path):
+        """Test the seed is cached under its request URL and redirected documents are not cached."""
+        config = ScraperConfig(cache_pages=True, collect_ui_inventory=False, network_idle_ms=0)
+        scraper = SiteScraper("https://Example.com", str(tmp_path), config)
+        scraper.page_processors = []
+        scraper._discover_links = AsyncMock()
+        # Nothing is opened until the crawl runs
+        assert scraper._page_cache is None
+        scraper._open_page_cache()
+        
+        def make_page(final_url, redirected=False):
+            page = Mock()
+            page.goto = AsyncMock(return_value=mock_response(final_url, b"<html></html>", "text/html", redirected))
+            page.route = AsyncMock()
+            page.wait_for_load_state = AsyncMock()
+            page.close = AsyncMock()
+            return page
+        
+        async def scrape(url, page):
+            context = Mock()
+            context.new_page = AsyncMock(return_value=page)
+            scraper.seen_urls.discard(url)
+            await scraper._scrape_page(context, url, 0)
+        
+        # Cold run: the browser requests the seed with a trailing slash
+        await scrape("https://Example.com", make_page("https://example.com/"))
+        await scrape("https://example.com/docs", make_page("https://example.com/docs/", redirected=True))
+        
+        # Warm run: the seed is served from the cache, the redirected page is fetched again
+        seed_page = make_page("https://example.com/")
+        await scrape("https://Example.com", seed_page)
+        matcher = seed_page.route.await_args.args[0]
+        assert matcher("https://example.com/") is True
+        
+        docs_page = make_page("https://example.com/docs/", redirected=True)
+        await scrape("https://example.com/docs", docs_page)
+        docs_page.route.assert_not_awaited()
+        
+        scraper._close_page_cache()
+        assert scraper._page_cache is None
+    
+    async def test_failed_load_releases_slot_for_parked_url(self, tmp_path):
+        """Test a URL popped over the page limit is requeued when an in-flight load fails."""
+        config = ScraperConfig(max_pages=1, collect_ui_inventory=False)
+        scraper = SiteScraper("https://example.com", str(tmp_path), config)
+        
+        release = asyncio.Event()
+        
+        async def failing_new_page():
+            await release.wait()
+            raise RuntimeError("browser closed")
+        
+        context = Mock()
+        context.new_page = failing_new_page
+        
+        first = asyncio.create_task(scraper._scrape_page(context, "https://example.com/a", 0))
+        await asyncio.sleep(0)
+        # The only slot is reserved by the pending load, so /b is parked instead of dropped
+        await scraper._scrape_page(context, "https://example.com/b", 1)
+        assert scraper.to_visit.empty()
+        
+        release.set()
+        await first
+        
+        assert scraper.page_count == 0
+        assert scraper.failed_urls == {"https://example.com/a"}
+        assert scraper.to_visit.get_nowait() == ("https://example.com/b", 1)
+    
+    async def test_new_context_skips_routing_without_filters(self, tmp_path):
+        """Test request interception, which disables the HTTP cache, is only installed when needed."""
+        def make_browser():
+            context = Mock()
+            context.route = AsyncMock()
+            browser = Mock()
+            browser.new_context = AsyncMock(return_value=context)
+            return browser, context
+        
+        browser, context = make_browser()
+        await SiteScraper("https://example.com", str(tmp_path))._new_context(browser)
+        context.route.assert_awaited_once()
+        
+        unfiltered = ScraperConfig(block_host_patterns=[], abort_resource_types=[])
+        browser, context = make_browser()
+        await SiteScraper("https://example.com", str(tmp_path), unfiltered)._new_context(browser)
+        context.route.assert_not_awaited()
+        context.on.assert_called_once()
+    
+    async def test_enqueue_dedupes_and_drops_when_full(self, tmp_path):
+        """Test URLs are queued once and dropped, not blocked on, when the frontier is full."""
+        scraper = SiteScraper("https://example.com", str(tmp_path))
+        scraper.to_visit = asyncio.Queue(maxsize=1)
+        
+        scraper._enqueue("https://example.com/a", 1)
+        scraper._enqueue("https://example.com/a", 2)
+        assert scraper.to_visit.qsize() == 1
+        
+        # Dropped URLs are not marked queued, so they can be found again later
+        scraper._enqueue("https://example.com/b", 1)
+        assert scraper.to_visit.qsize() == 1
+        assert "https://example.com/b" not in scraper._queued
+    
+    async def test_discover_links(self, tmp_path):
+        """Test discovered links are filtered, normalized and queued one level deeper."""
+        scraper = SiteScraper("https://example.com", str(tmp_path), ScraperConfig(max_depth=2))
+        page = Mock()
+        page.eval_on_selector_all = AsyncMock(return_value=[
+            "/about", "/about#team", "https://other.com/", "/logo.png", "mailto:hi@example.com"
+        ])
+        
+        await scraper._discover_links(page, "https://example.com/", 1)
+        assert scraper.to_visit.get_nowait() == ("https://example.com/about", 2)
+        assert scraper.to_visit.empty()
+        
+        # Links on a page at max depth are never read
+        page.eval_on_selector_all.reset_mock()
+        await scraper._discover_links(page, "https://example.com/about", 2)
+        page.eval_on_selector_all.assert_not_awaited()
+        assert scraper.to_visit.empty()
+    
+    async def test_route_handler_aborts_unwanted_requests(self, tmp_path):
+        """Test blocked hosts and aborted resource types never reach the network."""
+        scraper = SiteScraper("https://example.com", str(tmp_path))
+        
+        def make_route(url, resource_type):
+            route = Mock()
+            route.request.url = url
+            route.request.resource_type = resource_type
+            route.abort = AsyncMock()
+            route.continue_ = AsyncMock()
+            return route
+        
+        blocked = make_route("https://www.google-analytics.com/collect", "xhr")
+        media = make_route("https://example.com/intro.mp4", "media")
+        allowed = make_route("https://example.com/app.css", "stylesheet")
+        for route in (blocked, media, allowed):
+            await scraper._route_handler(route)
+        
+        blocked.abort.assert_awaited_once()
+        media.abort.assert_awaited_once()
+        allowed.continue_.assert_awaited_once()
+        allowed.abort.assert_not_awaited()
 
 
 # Utility test functions
@@ -276,6 +599,26 @@ def test_config_validation():
         assert hasattr(config, field), f"Missing field: {field}"
 
 
+
+def test_cli_overrides():
+    """Test only flags given on the command line override the config."""
+    config = ScraperConfig(headless=False, save_screenshots=True, max_pages=7, respect_robots_txt=True)
+    apply_args_to_config(config, create_parser().parse_args(["https://example.com"]))
+    
+    assert config.headless is False
+    assert config.save_screenshots is True
+    assert config.max_pages == 7
+    assert config.respect_robots_txt is True
+    
+    config = ScraperConfig()
+    args = create_parser().parse_args(["https://example.com", "--no-screenshots", "--no-headless", "--max-pages", "3"])
+    apply_args_to_config(config, args)
+    
+    assert config.save_screenshots is False
+    assert config.headless is False
+    assert config.max_pages == 3
+    assert config.save_html is True
+
 def test_url_utils_edge_cases():
     """Test URL utilities with edge cases."""
     # Empty or None URLs